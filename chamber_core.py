@@ -0,0 +1,162 @@
+import numpy as np
+from functools import lru_cache
+from dataclasses import dataclass
+from collections import namedtuple
+
+# Chamber dimensions (width, depth, height) in mm per machine type
+CHAMBER_DIMENSIONS = {
+    "SF50": (400, 300, 400),
+    "SF100": (400, 600, 400),
+}
+MAX_PARTS_ALONG_HEIGHT = 5
+
+# Raw user inputs; a hashable key for calculate_parts_fitting and the app's caches
+ChamberInputs = namedtuple(
+    "ChamberInputs",
+    "machine_type solvent part_width part_depth part_height spacing_width spacing_depth spacing_height",
+)
+
+# Precomputed chamber/part layout shared by the visualizer and the PDF report
+@dataclass(slots=True, frozen=True)
+class ChamberConfig:
+    chamber_width: int
+    chamber_depth: int
+    chamber_height: int
+    effective_chamber_width: int
+    effective_chamber_depth: int
+    effective_chamber_height: int
+    part_width: int
+    part_depth: int
+    part_height: int
+    part_width_with_spacing: int
+    part_depth_with_spacing: int
+    part_height_with_spacing: int
+    parts_along_width: int
+    parts_along_depth: int
+    parts_along_height: int
+    x_offset: float
+    y_offset: float
+    z_offset: float
+
+    @property
+    def chamber_dimensions(self):
+        return (self.chamber_width, self.chamber_depth, self.chamber_height)
+
+    @property
+    def total_parts(self):
+        return self.parts_along_width * self.parts_along_depth * self.parts_along_height
+
+# Usable chamber volume once the wall clearance (wider for PURE solvent) is removed
+def _effective_chamber_dimensions(machine_type, solvent):
+    chamber_width, chamber_depth, chamber_height = CHAMBER_DIMENSIONS[machine_type]
+
+    chamber_clearance_width, chamber_clearance_depth, chamber_clearance_height = 50, 50, 50
+    if solvent == "PURE":
+        chamber_clearance_width += 50
+        chamber_clearance_depth += 50
+
+    return (
+        chamber_width - chamber_clearance_width,
+        chamber_depth - chamber_clearance_depth,
+        chamber_height - chamber_clearance_height,
+    )
+
+# Range check shared by the scalar and batch paths, given the smallest part size and spacing.
+# A positive part size also keeps every pitch above zero for the floor divisions
+def _check_sizes(min_part_dim, min_spacing):
+    if min_part_dim <= 0:
+        raise ValueError("Invalid part dimensions! Please enter positive sizes in mm.")
+    if min_spacing < 0:
+        raise ValueError("Invalid spacing! Please enter spacings of 0 mm or more.")
+
+# Layout arithmetic behind calculate_parts_fitting, on validated integer inputs
+def _compute_parts_fitting(machine_type, solvent, part_width, part_depth, part_height,
+                           spacing_width, spacing_depth, spacing_height):
+    chamber_width, chamber_depth, chamber_height = CHAMBER_DIMENSIONS[machine_type]
+    effective_chamber_width, effective_chamber_depth, effective_chamber_height = (
+        _effective_chamber_dimensions(machine_type, solvent)
+    )
+
+    part_width_with_spacing = part_width + spacing_width
+    part_depth_with_spacing = part_depth + spacing_depth
+    part_height_with_spacing = part_height + spacing_height
+
+    parts_along_width = effective_chamber_width // part_width_with_spacing
+    parts_along_depth = effective_chamber_depth // part_depth_with_spacing
+    parts_along_height = min(MAX_PARTS_ALONG_HEIGHT, effective_chamber_height // part_height_with_spacing)
+
+    # Offsets that center the part grid inside the chamber
+    x_offset = (chamber_width - parts_along_width * part_width_with_spacing) / 2
+    y_offset = (chamber_depth - parts_along_depth * part_depth_with_spacing) / 2
+    z_offset = (chamber_height - parts_along_height * part_height_with_spacing) / 2
+
+    return ChamberConfig(
+        chamber_width=chamber_width,
+        chamber_depth=chamber_depth,
+        chamber_height=chamber_height,
+        effective_chamber_width=effective_chamber_width,
+        effective_chamber_depth=effective_chamber_depth,
+        effective_chamber_height=effective_chamber_height,
+        part_width=part_width,
+        part_depth=part_depth,
+        part_height=part_height,
+        part_width_with_spacing=part_width_with_spacing,
+        part_depth_with_spacing=part_depth_with_spacing,
+        part_height_with_spacing=part_height_with_spacing,
+        parts_along_width=parts_along_width,
+        parts_along_depth=parts_along_depth,
+        parts_along_height=parts_along_height,
+        x_offset=x_offset,
+        y_offset=y_offset,
+        z_offset=z_offset,
+    )
+
+# Function to calculate parts fitting from ChamberInputs; memoized (the function is pure and
+# the returned config is frozen) and raises ValueError for invalid input
+@lru_cache(maxsize=128)
+def calculate_parts_fitting(inputs):
+    machine_type = inputs.machine_type.strip()
+    if machine_type not in CHAMBER_DIMENSIONS:
+        raise ValueError("Invalid machine type! Please select 'SF50' or 'SF100'.")
+
+    # All dimensions are whole mm, so everything downstream is integer arithmetic
+    try:
+        part_dims = (int(inputs.part_width), int(inputs.part_depth), int(inputs.part_height))
+        spacings = (int(inputs.spacing_width), int(inputs.spacing_depth), int(inputs.spacing_height))
+    except (TypeError, ValueError, OverflowError) as exc:  # OverflowError: int() of an infinite size
+        raise ValueError("Invalid part dimensions! Please enter positive sizes in mm.") from exc
+
+    # Callers are not limited to the app's widgets, so the ranges are checked here too
+    _check_sizes(min(part_dims), min(spacings))
+
+    return _compute_parts_fitting(machine_type, inputs.solvent.strip(), *part_dims, *spacings)
+
+# Vectorized fitting for sweeps over many part geometries in one machine/solvent setup.
+# part_dims and spacings are (M, 3) arrays of width/depth/height; returns an (M, 4) int
+# array of parts along width, depth and height plus the total part count per row.
+# Inputs are cast and validated like calculate_parts_fitting, so each row matches it.
+def calculate_parts_fitting_batch(machine_type, solvent, part_dims, spacings):
+    machine_type = machine_type.strip()
+    if machine_type not in CHAMBER_DIMENSIONS:
+        raise ValueError(f"Invalid machine type {machine_type!r}; expected 'SF50' or 'SF100'.")
+
+    # Truncate to whole mm like int() in the scalar path
+    try:
+        part_dims = np.asarray(part_dims, dtype=np.float64)
+        spacings = np.asarray(spacings, dtype=np.float64)
+    except (TypeError, ValueError) as exc:
+        raise ValueError("Invalid part dimensions! Please enter positive sizes in mm.") from exc
+    if not (np.isfinite(part_dims).all() and np.isfinite(spacings).all()):
+        raise ValueError("Invalid part dimensions! Please enter positive sizes in mm.")
+    # Anything past the chamber fits zero times, so huge sizes are clamped (not rejected, as
+    # int() accepts them) to keep the int64 cast and the pitch sum from overflowing
+    part_dims = np.clip(part_dims, -2**31, 2**31).astype(np.int64)
+    spacings = np.clip(spacings, -2**31, 2**31).astype(np.int64)
+    _check_sizes(part_dims.min(initial=1), spacings.min(initial=0))
+
+    effective = np.array(_effective_chamber_dimensions(machine_type, solvent.strip()))
+    pitch = part_dims + spacings
+
+    counts = (effective // pitch).astype(np.int64)  # (M, 3)
+    np.minimum(counts[:, 2], MAX_PARTS_ALONG_HEIGHT, out=counts[:, 2])
+    return np.column_stack([counts, counts.prod(axis=1)])
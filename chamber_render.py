@@ -0,0 +1,236 @@
+import numpy as np
+import matplotlib
+matplotlib.use("Agg")  # Headless backend; plots are only ever exported to image bytes
+from matplotlib.figure import Figure
+from mpl_toolkits.mplot3d.art3d import Line3DCollection, Poly3DCollection
+from io import BytesIO
+from functools import lru_cache
+from pathlib import Path
+from fpdf import FPDF, XPos, YPos
+from PIL import Image
+
+# Reduce Agg work on the many quads emitted by the part grid
+matplotlib.rcParams["path.simplify"] = True
+matplotlib.rcParams["agg.path.chunksize"] = 10000
+
+# Corners of a unit cube (bottom ring, then top ring) and the corner indices of its six quad faces
+_UNIT_CUBE = np.array([
+    [0, 0, 0],
+    [1, 0, 0],
+    [1, 1, 0],
+    [0, 1, 0],
+    [0, 0, 1],
+    [1, 0, 1],
+    [1, 1, 1],
+    [0, 1, 1],
+], dtype=np.float32)
+FACE_IDX = np.array([
+    [0, 1, 5, 4],
+    [1, 2, 6, 5],
+    [2, 3, 7, 6],
+    [3, 0, 4, 7],
+    [0, 1, 2, 3],
+    [4, 5, 6, 7],
+])
+# Each quad face split into two triangles, shape (12, 3)
+_CUBE_TRIANGLES = np.concatenate([FACE_IDX[:, [0, 1, 2]], FACE_IDX[:, [0, 2, 3]]])
+# The six faces of the unit cube as quads, shape (6, 4, 3)
+_UNIT_FACES = _UNIT_CUBE[FACE_IDX]
+# The twelve edges of the unit cube (bottom ring, top ring, vertical risers), shape (12, 2, 3)
+_UNIT_EDGES = _UNIT_CUBE[np.array([
+    [0, 1], [1, 2], [2, 3], [3, 0],
+    [4, 5], [5, 6], [6, 7], [7, 4],
+    [0, 4], [1, 5], [2, 6], [3, 7],
+])]
+
+# Report assets, resolved once relative to this file rather than the working directory
+ASSET_DIR = Path(__file__).resolve().parent
+FONT_PATH = ASSET_DIR / "BebasNeue-Regular.ttf"
+LOGO_PATH = ASSET_DIR / "logo.png"
+LOGO_WIDTH_MM = 30
+LOGO_DPI = 300
+
+# Hardcoded plot colors
+PART_COLOR = "#4FC3CA"
+LINE_COLOR = "#152E35"
+
+# The plot is rasterized at the size it is embedded in the PDF report
+PLOT_WIDTH_MM = 190
+PLOT_DPI = 150
+
+# Pillow encoder settings per image format
+IMAGE_SAVE_KWARGS = {
+    "jpg": {"quality": 85, "optimize": False},  # fpdf2 embeds JPEG as-is, PNG is decoded and recompressed
+}
+
+# Encode a finished figure. The returned bytes are the single copy shared by the app's
+# cache, the on-screen image and the PDF (hashable and cheap to pickle)
+def encode_figure(fig, image_format="jpg"):
+    buffer = BytesIO()
+    fig.savefig(buffer, format=image_format, pil_kwargs=IMAGE_SAVE_KWARGS[image_format])
+    return buffer.getvalue()
+
+# Origins (minimum corner) of every part in the grid, shape (N, 3). Geometry is float32
+# throughout (whole and half mm are exact), halving the bytes mplot3d copies and sorts
+def _part_origins(config):
+    xs, ys, zs = np.meshgrid(
+        config.x_offset + np.arange(config.parts_along_width, dtype=np.float32) * config.part_width_with_spacing,
+        config.y_offset + np.arange(config.parts_along_depth, dtype=np.float32) * config.part_depth_with_spacing,
+        config.z_offset + np.arange(config.parts_along_height, dtype=np.float32) * config.part_height_with_spacing,
+        indexing="ij",
+    )
+    return np.stack([xs, ys, zs], axis=-1).reshape(-1, 3)
+
+# Function to build the 3D chamber figure. It is created outside pyplot, so it is never
+# registered with (or leaked by) the pyplot figure manager and is freed as soon as it is dropped
+def build_chamber_figure(config):
+    chamber_width, chamber_depth, chamber_height = config.chamber_dimensions
+    part_color, line_color = PART_COLOR, LINE_COLOR
+
+    plot_width_in = PLOT_WIDTH_MM / 25.4
+    fig = Figure(figsize=(plot_width_in, plot_width_in * 0.75), dpi=PLOT_DPI)
+    ax = fig.add_subplot(111, projection="3d")
+    ax.computed_zorder = False  # Draw order is fixed below: chamber outline first, then the parts
+
+    # All 12 chamber edges as a single collection
+    chamber_segments = _UNIT_EDGES * np.array(config.chamber_dimensions, dtype=np.float32)
+    ax.add_collection3d(Line3DCollection(chamber_segments, colors=line_color, linewidths=1, zorder=1))
+
+    origins = _part_origins(config)
+
+    # Unit-cube faces scaled to the part size and translated to every origin
+    face_offsets = _UNIT_FACES * np.array([config.part_width, config.part_depth, config.part_height], dtype=np.float32)
+    faces = (origins[:, None, None, :] + face_offsets[None, :, :, :]).reshape(-1, 4, 3)  # (N * 6, 4, 3)
+
+    # All parts share a single collection, so it is added exactly once (or not at all)
+    if len(faces):
+        ax.add_collection3d(Poly3DCollection(faces, alpha=0.6, facecolors=part_color, edgecolors=line_color, zorder=2))
+
+    ax.set_xlim([0, chamber_width])
+    ax.set_ylim([0, chamber_depth])
+    ax.set_zlim([0, chamber_height])
+
+    # Set label colors
+    ax.set_xlabel("Width (mm)", color=line_color)
+    ax.set_ylabel("Depth (mm)", color=line_color)
+    ax.set_zlabel("Height (mm)", color=line_color)
+
+    return fig
+
+# Function to build the interactive 3D view; plotly renders it client-side (WebGL), so
+# rotating and zooming cost the server nothing
+def build_interactive_view(config):
+    import plotly.graph_objects as go  # Only this opt-in view needs plotly, so it loads on first use
+
+    chamber_width, chamber_depth, chamber_height = config.chamber_dimensions
+    fig = go.Figure()
+
+    # Chamber edges as one polyline trace; a NaN row after each edge breaks the line
+    segments = _UNIT_EDGES * np.array(config.chamber_dimensions, dtype=np.float32)
+    outline = np.concatenate([segments, np.full((len(segments), 1, 3), np.nan)], axis=1).reshape(-1, 3)
+    outline_x, outline_y, outline_z = outline.T
+    fig.add_trace(go.Scatter3d(x=outline_x, y=outline_y, z=outline_z, mode="lines",
+                               line=dict(color=LINE_COLOR), hoverinfo="skip", showlegend=False))
+
+    # All parts as one mesh: 8 vertices and 12 triangles per part
+    origins = _part_origins(config)
+    if len(origins):
+        corner_offsets = _UNIT_CUBE * np.array([config.part_width, config.part_depth, config.part_height], dtype=np.float32)
+        vertices = (origins[:, None, :] + corner_offsets[None, :, :]).reshape(-1, 3)
+        triangles = (_CUBE_TRIANGLES[None, :, :] + 8 * np.arange(len(origins))[:, None, None]).reshape(-1, 3)
+        fig.add_trace(go.Mesh3d(
+            x=vertices[:, 0], y=vertices[:, 1], z=vertices[:, 2],
+            i=triangles[:, 0], j=triangles[:, 1], k=triangles[:, 2],
+            color=PART_COLOR, opacity=0.6, flatshading=True, hoverinfo="skip",
+        ))
+
+    fig.update_layout(
+        scene=dict(
+            xaxis=dict(title="Width (mm)", range=[0, chamber_width]),
+            yaxis=dict(title="Depth (mm)", range=[0, chamber_depth]),
+            zaxis=dict(title="Height (mm)", range=[0, chamber_height]),
+            aspectmode="data",
+        ),
+        margin=dict(l=0, r=0, t=0, b=0),
+    )
+    return fig
+
+# The logo resampled once to its embedded size (LOGO_WIDTH_MM at LOGO_DPI), so fpdf2 does not
+# decode and recompress the full-resolution file for every report
+@lru_cache(maxsize=1)
+def _logo_image():
+    with Image.open(LOGO_PATH) as logo:
+        width_px = round(LOGO_WIDTH_MM / 25.4 * LOGO_DPI)
+        height_px = round(logo.height * width_px / logo.width)
+        return logo.resize((width_px, height_px), Image.LANCZOS)
+
+# Function to generate the PDF report
+def generate_pdf(inputs, result, plot_image):
+    pdf = FPDF()
+    pdf.add_page()
+
+    # Add custom font (Bebas Neue)
+    pdf.add_font("BebasNeue", "", FONT_PATH)
+    pdf.set_font("BebasNeue", size=24)
+    pdf.set_text_color(79, 195, 202)  # Set text color to #4FC3CA
+    pdf.cell(200, 10, txt="Chamber Parts Fitting Report", new_x=XPos.LMARGIN, new_y=YPos.NEXT, align="C")
+
+    # Add Company Logo
+    pdf.image(_logo_image(), x=10, y=15, w=LOGO_WIDTH_MM)
+
+    pdf.ln(20)  # Add some space after the logo
+
+    # Section: Parameters
+    pdf.set_draw_color(79, 195, 202)  # Divider color
+    pdf.set_line_width(0.5)
+    pdf.line(10, 40, 200, 40)  # Add a horizontal line
+
+    pdf.set_font("Arial", size=14)
+    pdf.set_text_color(0, 0, 0)  # Reset text color to black
+    pdf.cell(0, 10, txt="Parameters", new_x=XPos.LMARGIN, new_y=YPos.NEXT, align="L")
+    pdf.set_font("Arial", size=12)
+    parameters = "\n".join([
+        f"Machine Type: {inputs.machine_type}",
+        f"Solvent: {inputs.solvent}",
+        f"Part Dimensions (mm): {inputs.part_width} x {inputs.part_depth} x {inputs.part_height}",
+    ])
+    pdf.multi_cell(0, 10, parameters, align="L", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+
+    # Section: Results
+    pdf.ln(10)
+    pdf.set_draw_color(79, 195, 202)
+    pdf.line(10, 80, 200, 80)
+
+    pdf.set_font("BebasNeue", size=18)
+    pdf.set_text_color(79, 195, 202)
+    pdf.cell(0, 10, txt="Results", new_x=XPos.LMARGIN, new_y=YPos.NEXT, align="L")
+    pdf.set_font("Arial", size=12)
+    pdf.set_text_color(0, 0, 0)
+    results = "\n".join([
+        f"Total Parts: {result.total_parts}",
+        f"Parts Along Width: {result.parts_along_width}",
+        f"Parts Along Depth: {result.parts_along_depth}",
+        f"Parts Along Height: {result.parts_along_height}",
+    ])
+    pdf.multi_cell(0, 10, results, align="L", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+
+    # Section: Visualization
+    pdf.ln(10)
+    pdf.set_draw_color(79, 195, 202)
+    pdf.line(10, 120, 200, 120)
+
+    pdf.set_font("BebasNeue", size=18)
+    pdf.set_text_color(79, 195, 202)
+    pdf.cell(0, 10, txt="Visualization", new_x=XPos.LMARGIN, new_y=YPos.NEXT, align="L")
+    pdf.ln(5)
+
+    # Add Visualization Plot (BytesIO over the cached bytes shares their memory, no copy)
+    pdf.image(BytesIO(plot_image), x=10, y=140, w=PLOT_WIDTH_MM)
+
+    # Footer Section
+    pdf.set_y(-30)  # Position footer at the bottom
+    pdf.set_font("Arial", size=10)
+    pdf.set_text_color(128, 128, 128)
+
+    # fpdf2 renders the document into its own bytearray; hand it out as bytes
+    return bytes(pdf.output())